@@ -0,0 +1,218 @@
+"""Check Claude Agent SDK installation and Claude Pro authentication.
+
+All checks share one Claude Code CLI process and a single conversation turn,
+so running the full suite pays the CLI startup and auth handshake only once.
+When only the status is checked, the CLI is stopped as soon as its init
+message arrives, so no turn is completed.
+
+Usage:
+    python auth_suite.py                  # run every check (same as --all)
+    python auth_suite.py --check-status   # print auth info from the init message
+    python auth_suite.py --test-pro       # ask a question and report its cost
+    python auth_suite.py --test-install   # verify the SDK imports
+    python auth_suite.py --all --cli-path /path/to/claude --verbose
+"""
+
+import argparse
+import os
+from contextlib import aclosing
+
+import anyio
+
+from claude_agent_sdk import (
+    AssistantMessage,
+    ClaudeAgentOptions,
+    ClaudeSDKClient,
+    ResultMessage,
+    SystemMessage,
+    TextBlock,
+)
+
+PROMPT = "What is 5 + 5? Answer in one sentence."
+INIT_TIMEOUT = 10.0
+
+
+def remove_api_key():
+    """Remove the API key so the CLI uses Claude Pro instead of the paid API."""
+    if 'ANTHROPIC_API_KEY' in os.environ:
+        del os.environ['ANTHROPIC_API_KEY']
+        print("[OK] Removed ANTHROPIC_API_KEY - will use Claude Pro subscription")
+    else:
+        print("[OK] No ANTHROPIC_API_KEY found - will use Claude Pro subscription")
+    print()
+
+
+def check_installation():
+    """Check that all public SDK imports work."""
+    print("=" * 70)
+    print("Installation Check")
+    print("=" * 70)
+
+    from claude_agent_sdk import (
+        ClaudeSDKError,
+        CLINotFoundError,
+        UserMessage,
+        query,
+    )
+
+    print("[OK] All imports successful!")
+    print(f"[OK] query: {query}")
+    print(f"[OK] ClaudeSDKClient: {ClaudeSDKClient}")
+    print(f"[OK] ClaudeAgentOptions: {ClaudeAgentOptions}")
+    print(f"[OK] UserMessage: {UserMessage}")
+    print(f"[OK] Errors: {ClaudeSDKError.__name__}, {CLINotFoundError.__name__}")
+    print()
+
+
+async def run_turn(client, verbose):
+    """Send the shared prompt once and collect every message of the reply."""
+    await client.query(PROMPT)
+    messages = []
+    async for message in client.receive_response():
+        if verbose:
+            print(f"{message}\n")
+        messages.append(message)
+    return messages
+
+
+async def read_init(options, verbose):
+    """Read messages up to the CLI init message.
+
+    Returns the init message in a list (empty if the CLI ended without one),
+    or None if it did not arrive within INIT_TIMEOUT seconds.
+    """
+    # Leaving the client disconnects it in this task, which stops the CLI
+    # before it finishes the turn
+    async with ClaudeSDKClient(options=options) as client:
+        # Only the reading is timed, so the disconnect never runs cancelled
+        with anyio.move_on_after(INIT_TIMEOUT):
+            await client.query(PROMPT)
+            async with aclosing(client.receive_messages()) as messages:
+                async for message in messages:
+                    if verbose:
+                        print(f"{message}\n")
+                    if isinstance(message, SystemMessage) and message.subtype == 'init':
+                        return [message]
+            return []
+    return None
+
+
+def check_status(messages):
+    """Print authentication details from the CLI init message."""
+    print("=" * 70)
+    print("Claude Code Authentication Status")
+    print("=" * 70)
+
+    for message in messages:
+        if isinstance(message, SystemMessage) and message.subtype == 'init':
+            data = message.data
+            break
+    else:
+        print("[ERROR] No init message received")
+        print()
+        return
+
+    # Key authentication fields
+    print(f"API Key Source: {data.get('apiKeySource', 'Not specified')}")
+    print(f"Login Method: {data.get('forceLoginMethod', 'Not specified')}")
+    print(f"Model: {data.get('model', 'Not specified')}")
+    print(f"Claude Code Version: {data.get('claude_code_version', 'Not specified')}")
+    print(f"Session ID: {data.get('session_id', 'Not specified')}")
+
+    # Check if there's any billing/subscription info
+    if 'billing' in data:
+        print(f"Billing Info: {data['billing']}")
+
+    if 'subscription' in data:
+        print(f"Subscription Info: {data['subscription']}")
+
+    print()
+    print("Full init data:")
+    print("-" * 70)
+    for key, value in data.items():
+        if key not in ['tools', 'mcp_servers', 'slash_commands', 'agents', 'skills', 'plugins']:
+            print(f"  {key}: {value}")
+    print()
+
+
+def check_pro(messages):
+    """Print Claude's answer and whether the turn was billed."""
+    print("=" * 70)
+    print("Claude Pro Usage Check")
+    print("=" * 70)
+
+    for message in messages:
+        if isinstance(message, AssistantMessage):
+            print("Response from Claude:")
+            for block in message.content:
+                if isinstance(block, TextBlock):
+                    print(f"  {block.text}")
+            print()
+        elif isinstance(message, ResultMessage):
+            print("Session completed successfully!")
+            print(f"  Duration: {message.duration_ms}ms")
+            print(f"  API Duration: {message.duration_api_ms}ms")
+            print(f"  Turns: {message.num_turns}")
+
+            # Check if we're using Claude Pro (cost should be 0 or None)
+            if message.total_cost_usd is None or message.total_cost_usd == 0:
+                print("  Cost: FREE (using Claude Pro subscription) [OK]")
+            else:
+                print(f"  Cost: ${message.total_cost_usd:.6f} (using paid API)")
+    print()
+
+
+async def main(args):
+    remove_api_key()
+
+    if args.test_install:
+        check_installation()
+
+    if not (args.check_status or args.test_pro):
+        return
+
+    options = ClaudeAgentOptions(max_turns=1, cli_path=args.cli_path)
+
+    try:
+        if args.test_pro:
+            # One CLI process and one turn serve every check below
+            async with ClaudeSDKClient(options=options) as client:
+                messages = await run_turn(client, args.verbose)
+        else:
+            # Only the init message is needed, so skip the full turn
+            messages = await read_init(options, args.verbose)
+            if messages is None:
+                print(f"[ERROR] Timed out after {INIT_TIMEOUT:.0f}s waiting for the CLI init message")
+                return
+    except Exception as e:
+        print(f"[ERROR] {type(e).__name__}: {e}")
+        print("\nPossible issues:")
+        print("1. Claude Code CLI not installed: npm install -g @anthropic-ai/claude-code")
+        print("2. Not logged in to Claude Pro: Run 'claude login' or 'claude-code login'")
+        print("3. CLI path incorrect (Windows users may need to pass --cli-path)")
+        return
+
+    if args.check_status:
+        check_status(messages)
+
+    if args.test_pro:
+        check_pro(messages)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check-status", action="store_true", help="print auth info from the CLI init message")
+    parser.add_argument("--test-pro", action="store_true", help="ask a question and report whether it was billed")
+    parser.add_argument("--test-install", action="store_true", help="verify that the SDK imports work")
+    parser.add_argument("--all", action="store_true", help="run every check (default)")
+    parser.add_argument("--cli-path", help="path to the Claude Code CLI executable")
+    parser.add_argument("--verbose", action="store_true", help="print every message received")
+    args = parser.parse_args()
+
+    if args.all or not (args.check_status or args.test_pro or args.test_install):
+        args.check_status = args.test_pro = args.test_install = True
+    return args
+
+
+if __name__ == "__main__":
+    anyio.run(main, parse_args())
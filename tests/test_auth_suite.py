@@ -0,0 +1,143 @@
+"""Tests for the auth_suite.py check script."""
+
+import argparse
+import json
+from unittest.mock import patch
+
+import anyio
+
+import auth_suite
+from claude_agent_sdk._internal.transport import Transport
+
+
+class FakeTransport(Transport):
+    """Transport that plays the CLI's side of one turn and logs its lifecycle."""
+
+    def __init__(self, log, send_init=True, finish_turn=True):
+        self.log = log
+        self.send_init = send_init
+        self.finish_turn = finish_turn
+        self._send, self._receive = anyio.create_memory_object_stream(100)
+
+    async def connect(self):
+        self.log.append("connect")
+
+    async def write(self, data):
+        message = json.loads(data)
+        if message["type"] == "control_request":
+            await self._send.send(
+                {
+                    "type": "control_response",
+                    "response": {
+                        "subtype": "success",
+                        "request_id": message["request_id"],
+                        "response": {},
+                    },
+                }
+            )
+        elif message["type"] == "user":
+            self.log.append("query")
+            if self.send_init:
+                await self._send.send(
+                    {
+                        "type": "system",
+                        "subtype": "init",
+                        "apiKeySource": "none",
+                        "model": "claude-test",
+                    }
+                )
+            if self.finish_turn:
+                await self._send.send(
+                    {
+                        "type": "assistant",
+                        "message": {
+                            "content": [{"type": "text", "text": "5 + 5 is 10."}],
+                            "model": "claude-test",
+                        },
+                    }
+                )
+                await self._send.send(
+                    {
+                        "type": "result",
+                        "subtype": "success",
+                        "duration_ms": 10,
+                        "duration_api_ms": 8,
+                        "is_error": False,
+                        "num_turns": 1,
+                        "session_id": "test",
+                        "total_cost_usd": 0,
+                    }
+                )
+
+    async def read_messages(self):
+        async for message in self._receive:
+            yield message
+
+    async def close(self):
+        self.log.append("close")
+        self._send.close()
+
+    def is_ready(self):
+        return True
+
+    async def end_input(self):
+        pass
+
+
+def run_suite(monkeypatch, log, check_status=False, test_pro=False, **transport):
+    """Run auth_suite.main against a FakeTransport."""
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    args = argparse.Namespace(
+        check_status=check_status,
+        test_pro=test_pro,
+        test_install=False,
+        cli_path=None,
+        verbose=False,
+    )
+
+    async def _run():
+        with anyio.fail_after(5):
+            await auth_suite.main(args)
+
+    with patch(
+        "claude_agent_sdk._internal.transport.subprocess_cli.SubprocessCLITransport",
+        side_effect=lambda **_: FakeTransport(log, **transport),
+    ):
+        anyio.run(_run)
+
+
+class TestAuthSuite:
+    """Test which checks run a full turn and that the CLI is always closed."""
+
+    def test_status_only_stops_at_init(self, monkeypatch, capsys):
+        """Test that --check-status alone closes the CLI at the init message."""
+        log = []
+        run_suite(monkeypatch, log, check_status=True, finish_turn=False)
+
+        out = capsys.readouterr().out
+        assert "API Key Source: none" in out
+        assert "Model: claude-test" in out
+        assert "[ERROR]" not in out
+        assert log == ["connect", "query", "close"]
+
+    def test_status_only_times_out(self, monkeypatch, capsys):
+        """Test that a CLI that never sends init is closed after the timeout."""
+        monkeypatch.setattr(auth_suite, "INIT_TIMEOUT", 0.1)
+        log = []
+        run_suite(
+            monkeypatch, log, check_status=True, send_init=False, finish_turn=False
+        )
+
+        assert "Timed out" in capsys.readouterr().out
+        assert log == ["connect", "query", "close"]
+
+    def test_pro_runs_full_turn(self, monkeypatch, capsys):
+        """Test that --test-pro reads the ResultMessage and reports status too."""
+        log = []
+        run_suite(monkeypatch, log, check_status=True, test_pro=True)
+
+        out = capsys.readouterr().out
+        assert "API Key Source: none" in out
+        assert "5 + 5 is 10." in out
+        assert "Cost: FREE" in out
+        assert log == ["connect", "query", "close"]
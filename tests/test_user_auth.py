@@ -0,0 +1,490 @@
+"""Tests for the user authentication example."""
+
+import hashlib
+import json
+from datetime import datetime
+
+import anyio
+import pytest
+
+from claude_agent_sdk import AssistantMessage, ResultMessage, TextBlock
+from user_auth import auth_system
+from user_auth.auth_system import (
+    UserAuthSystem,
+    _classify_password,
+    _parse_password_verdict,
+    _UserStore,
+    _UserTable,
+)
+
+
+class FakeClaudeClient:
+    """Stand-in for ClaudeSDKClient that replays scripted replies.
+
+    Each client created takes the next ``(delay, reply)`` from ``replies``;
+    ``reply`` is the text to answer with, None for a reply without text, or
+    an exception to raise while reading.
+    """
+
+    replies: list = []
+    created = 0
+    active = 0
+    peak = 0
+    disconnected = 0
+
+    @classmethod
+    def reset(cls, replies):
+        cls.replies = list(replies)
+        cls.created = cls.active = cls.peak = cls.disconnected = 0
+
+    def __init__(self, options=None):
+        self.options = options
+        self.delay, self.reply = type(self).replies.pop(0)
+        type(self).created += 1
+
+    async def connect(self):
+        cls = type(self)
+        cls.active += 1
+        cls.peak = max(cls.peak, cls.active)
+
+    async def disconnect(self):
+        type(self).active -= 1
+        type(self).disconnected += 1
+
+    async def query(self, prompt):
+        pass
+
+    async def receive_response(self):
+        await anyio.sleep(self.delay)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        content = [] if self.reply is None else [TextBlock(text=self.reply)]
+        yield AssistantMessage(content=content, model="claude-test")
+        yield ResultMessage(
+            subtype="success",
+            duration_ms=1,
+            duration_api_ms=1,
+            is_error=False,
+            num_turns=1,
+            session_id="test",
+        )
+
+
+@pytest.fixture
+def fake_claude(monkeypatch):
+    monkeypatch.setattr(auth_system, "ClaudeSDKClient", FakeClaudeClient)
+    return FakeClaudeClient
+
+
+class TestPasswordChecks:
+    """Test local password classification and parsing of Claude's verdict."""
+
+    @pytest.fixture(autouse=True)
+    def _without_zxcvbn(self, monkeypatch):
+        # Exercise the built-in rules even where zxcvbn is installed
+        monkeypatch.setattr(auth_system, "zxcvbn", None)
+
+    @pytest.mark.parametrize(
+        "password, feedback",
+        [
+            (
+                "short",
+                "Password needs at least 8 characters, an uppercase letter, "
+                "a number and a symbol.",
+            ),
+            ("alllowercase1!", "Password needs an uppercase letter."),
+            ("NoDigits!!", "Password needs a number."),
+            (
+                "Password1!x",
+                "Password contains an easily guessed pattern ('Password').",
+            ),
+            ("Abcd!1234xyz", "Password contains an easily guessed pattern ('Abcd')."),
+            ("Aaa!1bbbxyz", "Password contains an easily guessed pattern ('Aaa')."),
+        ],
+    )
+    def test_classify_rejects(self, password, feedback):
+        """Test that weak passwords are rejected with specific feedback."""
+        assert _classify_password(password) == (False, feedback)
+
+    def test_classify_accepts(self):
+        """Test that a varied password without weak patterns is accepted."""
+        assert _classify_password("Zq8#mLw2!v") == (
+            True,
+            "Strong password with good character variety.",
+        )
+
+    @pytest.mark.parametrize(
+        "response, accepted",
+        [
+            ("VALID", True),
+            ("**VALID** - strong password", True),
+            ("INVALID: too short", False),
+            # VALID inside INVALID must not count as a VALID verdict
+            ("**INVALID** - not a VALID choice", False),
+            ("Very weak password. VALID", False),
+            ("Extremely weak.", False),
+            ("This is a strong password.", True),
+            ("It meets all requirements.", True),
+            ("Strong, but weak against dictionary attacks.", False),
+            ("The password is weak.", False),
+            ("No clear verdict.", False),
+        ],
+    )
+    def test_parse_password_verdict(self, response, accepted):
+        """Test reading Claude's accept/reject decision from its review."""
+        assert _parse_password_verdict(response) is accepted
+
+
+class TestUserTable:
+    """Test conversion between the user table and its on-disk records."""
+
+    def test_records_round_trip(self):
+        """Test that records survive a load/save round trip unchanged."""
+        records = {
+            "alice": {
+                "password_hash": "ab" * 32,
+                "salt": "cd" * 16,
+                "email": "alice@example.com",
+                "created_at": 1761408000000,
+                "last_login": 1761494400000,
+            },
+            "bob": {
+                "password_hash": "ef" * 32,
+                "salt": "01" * 16,
+                "email": "bob@example.com",
+                "created_at": 1761408000000,
+                "last_login": None,
+            },
+        }
+
+        table = _UserTable.from_records(records)
+
+        assert len(table) == 2
+        assert "alice" in table
+        assert table.credentials("alice") == (
+            bytes.fromhex("cd" * 16),
+            bytes.fromhex("ab" * 32),
+        )
+        assert table.info("bob")["last_login"] is None
+        assert table.to_records() == records
+
+    def test_legacy_records(self):
+        """Test loading records with ISO timestamps and unsalted hashes."""
+        password_hash = hashlib.sha256(b"OldPassw0rd!").hexdigest()
+        table = _UserTable.from_records(
+            {
+                "legacy": {
+                    "password_hash": password_hash,
+                    "email": "legacy@example.com",
+                    "created_at": "2025-01-01T12:00:00",
+                    "last_login": None,
+                }
+            }
+        )
+
+        salt, stored_hash = table.credentials("legacy")
+        assert salt == _UserTable.LEGACY_SALT
+        assert stored_hash.hex() == password_hash
+
+        created_at = int(datetime(2025, 1, 1, 12).timestamp() * 1000)
+        assert table.info("legacy") == {
+            "email": "legacy@example.com",
+            "created_at": created_at,
+            "last_login": None,
+        }
+        # Legacy rows are written back without a salt and with int timestamps
+        assert table.to_records() == {
+            "legacy": {
+                "password_hash": password_hash,
+                "email": "legacy@example.com",
+                "created_at": created_at,
+                "last_login": None,
+            }
+        }
+
+
+class TestLogin:
+    """Test password checks on login."""
+
+    def test_legacy_hash_upgraded_on_login(self, tmp_path):
+        """Test that an unsalted SHA-256 account is rehashed with scrypt."""
+
+        async def _test():
+            db_path = tmp_path / "users.json"
+            db_path.write_text(
+                json.dumps(
+                    {
+                        "legacy": {
+                            "password_hash": hashlib.sha256(
+                                b"OldPassw0rd!"
+                            ).hexdigest(),
+                            "email": "legacy@example.com",
+                            "created_at": "2025-01-01T12:00:00",
+                            "last_login": None,
+                        }
+                    }
+                )
+            )
+            auth = UserAuthSystem(str(db_path))
+
+            success, _, token = await auth.login("legacy", "OldPassw0rd!")
+            assert success
+            assert token is not None
+
+            salt, password_hash = auth.users.credentials("legacy")
+            assert salt != _UserTable.LEGACY_SALT
+            assert password_hash == hashlib.scrypt(
+                b"OldPassw0rd!", salt=salt, n=2**14, r=8, p=1, dklen=32
+            )
+
+            saved = json.loads(db_path.read_text())["legacy"]
+            assert saved["salt"] == salt.hex()
+            assert saved["password_hash"] == password_hash.hex()
+            assert isinstance(saved["last_login"], int)
+
+            # The upgraded account still accepts the same password only
+            success, _, _ = await auth.login("legacy", "OldPassw0rd!")
+            assert success
+            success, _, token = await auth.login("legacy", "wrong")
+            assert not success
+            assert token is None
+
+        anyio.run(_test)
+
+    def test_unknown_user_rejected(self, tmp_path):
+        """Test that an unknown username fails like a wrong password."""
+
+        async def _test():
+            auth = UserAuthSystem(str(tmp_path / "users.json"))
+            assert await auth.login("nobody", "MyStr0ng!Pass2024") == (
+                False,
+                "Invalid username or password",
+                None,
+            )
+
+        anyio.run(_test)
+
+
+class TestSessions:
+    """Test session expiry."""
+
+    def test_sweep_sessions(self, tmp_path, monkeypatch):
+        """Test that expired sessions are swept, including logged-out ones."""
+
+        async def _test():
+            now = [1_000_000]
+            monkeypatch.setattr(auth_system, "_now_ms", lambda: now[0])
+            ttl = auth_system._SESSION_TTL_MS
+
+            auth = UserAuthSystem(str(tmp_path / "users.json"))
+            await auth.register_user("dave", "MyStr0ng!Pass2024", "dave@example.com")
+
+            _, _, first = await auth.login("dave", "MyStr0ng!Pass2024")
+            now[0] += 1000
+            _, _, second = await auth.login("dave", "MyStr0ng!Pass2024")
+            now[0] += 1000
+            _, _, third = await auth.login("dave", "MyStr0ng!Pass2024")
+
+            # A logged-out session leaves its heap entry behind
+            assert auth.logout(second)
+            assert len(auth._session_expiry) == 3
+
+            # Nothing has expired yet
+            auth._sweep_sessions(now[0])
+            assert set(auth.sessions) == {first, third}
+            assert len(auth._session_expiry) == 3
+
+            # Past the first two expiries: the live session and the stale
+            # heap entry of the logged-out one are both swept
+            now[0] = 1_000_000 + ttl + 1001
+            assert auth.verify_session(first) == (False, None)
+            assert auth.verify_session(third) == (True, "dave")
+            assert set(auth.sessions) == {third}
+            assert len(auth._session_expiry) == 1
+
+            now[0] += 1000
+            auth._sweep_sessions(now[0])
+            assert auth.sessions == {}
+            assert auth._session_expiry == []
+
+        anyio.run(_test)
+
+
+class TestUserStore:
+    """Test saving and sharing of the user database."""
+
+    def test_concurrent_changes_coalesce_into_one_write(self, tmp_path, monkeypatch):
+        """Test that a burst of changes is written to disk once."""
+        writes = []
+        write = _UserStore._write
+        monkeypatch.setattr(
+            _UserStore,
+            "_write",
+            lambda store, records: (writes.append(records), write(store, records)),
+        )
+
+        async def _test():
+            auth = UserAuthSystem(str(tmp_path / "users.json"))
+            async with anyio.create_task_group() as tg:
+                for _ in range(10):
+                    tg.start_soon(auth._mark_dirty)
+
+            assert len(writes) == 1
+            assert not auth._store.save_pending
+
+        anyio.run(_test)
+
+    def test_failed_write_stays_pending(self, tmp_path, monkeypatch):
+        """Test that a failed write leaves the changes pending for a retry."""
+
+        def fail(store, records):
+            raise OSError("disk full")
+
+        async def _test():
+            db_path = tmp_path / "users.json"
+            auth = UserAuthSystem(str(db_path))
+            monkeypatch.setattr(_UserStore, "_write", fail)
+            with pytest.raises(OSError):
+                await auth.register_user(
+                    "erin", "MyStr0ng!Pass2024", "erin@example.com"
+                )
+            assert auth._store.save_pending
+            assert not db_path.exists()
+
+            monkeypatch.undo()
+            await auth._store.save()
+            assert not auth._store.save_pending
+            assert "erin" in json.loads(db_path.read_text())
+
+        anyio.run(_test)
+
+    def test_instances_share_users(self, tmp_path):
+        """Test that instances on the same file see each other's users."""
+
+        async def _test():
+            db_path = tmp_path / "users.json"
+            first = UserAuthSystem(str(db_path))
+            second = UserAuthSystem(str(tmp_path / "." / "users.json"))
+
+            await first.register_user("frank", "MyStr0ng!Pass2024", "frank@example.com")
+            assert second.get_user_info("frank")["email"] == "frank@example.com"
+
+            success, _, _ = await second.login("frank", "MyStr0ng!Pass2024")
+            assert success
+            assert first.get_user_info("frank")["last_login"] is not None
+
+            other = UserAuthSystem(str(tmp_path / "other.json"))
+            assert other.get_user_info("frank") is None
+
+        anyio.run(_test)
+
+    def test_changes_saved_periodically(self, tmp_path):
+        """Test that changes inside ``async with`` reach disk before exit."""
+
+        async def _test():
+            db_path = tmp_path / "users.json"
+            async with UserAuthSystem(str(db_path), save_interval=0.05) as auth:
+                await auth.register_user(
+                    "gina", "MyStr0ng!Pass2024", "gina@example.com"
+                )
+                await anyio.sleep(0.2)
+                assert "gina" in json.loads(db_path.read_text())
+
+        anyio.run(_test)
+
+    def test_changes_saved_when_cancelled(self, tmp_path):
+        """Test that the final save still runs when the block is cancelled."""
+
+        async def _test():
+            db_path = tmp_path / "users.json"
+            with anyio.move_on_after(0.3) as scope:
+                async with UserAuthSystem(str(db_path)) as auth:
+                    success, _ = await auth.register_user(
+                        "hank", "MyStr0ng!Pass2024", "hank@example.com"
+                    )
+                    assert success
+                    await anyio.sleep(5)
+
+            assert scope.cancelled_caught
+            assert "hank" in json.loads(db_path.read_text())
+
+        anyio.run(_test)
+
+
+class TestClaudeRequests:
+    """Test concurrency limits and hedging of Claude requests."""
+
+    def test_concurrency_limit(self, tmp_path, fake_claude):
+        """Test that one-off requests never exceed max_concurrent_claude."""
+        fake_claude.reset([(0.05, "ok")] * 6)
+
+        async def _test():
+            auth = UserAuthSystem(str(tmp_path / "users.json"), max_concurrent_claude=2)
+            async with anyio.create_task_group() as tg:
+                for _ in range(6):
+                    tg.start_soon(auth._ask, "system", "prompt")
+
+        anyio.run(_test)
+        assert fake_claude.created == 6
+        assert fake_claude.peak == 2
+        assert fake_claude.active == 0
+
+    def _hedged_ask(self, tmp_path, hedge_delay=10.0):
+        async def _test():
+            auth = UserAuthSystem(str(tmp_path / "users.json"), hedge_delay=hedge_delay)
+            with anyio.fail_after(2):
+                return await auth._hedged_ask("system", "prompt")
+
+        return anyio.run(_test)
+
+    def test_hedge_primary_wins(self, tmp_path, fake_claude):
+        """Test that a fast primary reply sends no backup request."""
+        fake_claude.reset([(0, "primary")])
+
+        assert self._hedged_ask(tmp_path) == "primary"
+        assert fake_claude.created == 1
+        assert fake_claude.disconnected == 1
+
+    def test_hedge_backup_wins_and_primary_is_cancelled(self, tmp_path, fake_claude):
+        """Test that a slow primary is cancelled once the backup answers."""
+        fake_claude.reset([(30, "primary"), (0, "backup")])
+
+        assert self._hedged_ask(tmp_path, hedge_delay=0.05) == "backup"
+        assert fake_claude.created == 2
+        assert fake_claude.disconnected == 2
+
+    @pytest.mark.parametrize("primary", [RuntimeError("primary failed"), None])
+    def test_hedge_failed_primary_starts_backup_at_once(
+        self, tmp_path, fake_claude, primary
+    ):
+        """Test that an error or empty primary reply starts the backup at once."""
+        fake_claude.reset([(0, primary), (0, "backup")])
+
+        # The default 10 s delay would trip the 2 s fail_after
+        assert self._hedged_ask(tmp_path) == "backup"
+        assert fake_claude.created == 2
+
+    def test_hedge_both_fail(self, tmp_path, fake_claude):
+        """Test that the first error is raised when both requests fail."""
+        fake_claude.reset(
+            [(0, RuntimeError("primary failed")), (0, RuntimeError("backup failed"))]
+        )
+
+        with pytest.raises(RuntimeError, match="primary failed"):
+            self._hedged_ask(tmp_path)
+        assert fake_claude.disconnected == 2
+
+    def test_shared_session_is_not_hedged(self, tmp_path, fake_claude):
+        """Test that calls on the shared session use it without a backup."""
+        fake_claude.reset([(0.1, "shared")])
+
+        async def _test():
+            async with UserAuthSystem(
+                str(tmp_path / "users.json"), hedge_delay=0.01
+            ) as auth:
+                assert fake_claude.created == 0
+                assert await auth._hedged_ask("system", "prompt") == "shared"
+                assert fake_claude.created == 1
+
+        anyio.run(_test)
+        assert fake_claude.disconnected == 1
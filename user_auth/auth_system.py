@@ -5,15 +5,33 @@ This module demonstrates how to build a user authentication system
 that leverages Claude for validation, security checks, and user feedback.
 """
 
+import array
 import hashlib
+import heapq
+import hmac
 import json
-import os
-from datetime import datetime, timedelta
+import re
+import secrets
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timezone
+from email.utils import parseaddr
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import anyio
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding/decoding
+    orjson = None
+
+try:
+    from zxcvbn import zxcvbn
+except ImportError:  # Optional: dictionary/pattern-based strength estimation
+    zxcvbn = None
+
 from claude_agent_sdk import (
     AssistantMessage,
     ClaudeAgentOptions,
@@ -21,59 +39,688 @@ from claude_agent_sdk import (
     TextBlock,
 )
 
+# Deterministic password strength rules
+_PASSWORD_MIN_LENGTH = 8
+_PASSWORD_CHAR_CLASSES = (
+    (re.compile(r"[A-Z]"), "an uppercase letter"),
+    (re.compile(r"[a-z]"), "a lowercase letter"),
+    (re.compile(r"\d"), "a number"),
+    (re.compile(r"[^A-Za-z0-9]"), "a symbol"),
+)
+# Common passwords, keyboard walks and runs that make a password guessable
+# even when it covers every character class
+_PASSWORD_WEAK_PATTERN_RE = re.compile(
+    r"password|passw0rd|p@ssw0?rd|qwerty|asdfgh|letmein|welcome|admin|iloveyou"
+    r"|monkey|dragon|sunshine|football|baseball|master"
+    r"|1234|2345|3456|4567|5678|6789|abcd"
+    r"|(.)\1\1",
+    re.IGNORECASE,
+)
+# Markers in Claude's password review. VALID/INVALID are matched as upper-case
+# words (markdown such as **VALID** is fine); the prose markers ignore case.
+_VERDICT_RE = re.compile(
+    r"\b(?P<invalid>INVALID)\b"
+    r"|\b(?P<valid>VALID)\b"
+    r"|(?P<very_weak>(?i:\b(?:extremely|very)\s+weak))"
+    r"|(?P<weak>(?i:\bweak))"
+    r"|(?P<strong>(?i:\bstrong\b|\bmeets\b[^.\n]*\brequirements?\b))"
+)
+_EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+
+
+# Timestamps are int64 milliseconds since the Unix epoch
+_SESSION_TTL_MS = 24 * 60 * 60 * 1000
+
+
+def _now_ms() -> int:
+    """Return the current time in milliseconds since the Unix epoch."""
+    return time.time_ns() // 1_000_000
+
+
+def _to_ms(value: Any) -> Optional[int]:
+    """Read a stored timestamp, accepting legacy ISO strings."""
+    if value is None or isinstance(value, int):
+        return value
+    # Older databases stored naive local-time ISO strings
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+
+def _format_ms(value: int) -> str:
+    """Format a millisecond timestamp as an ISO 8601 UTC string for display."""
+    return datetime.fromtimestamp(value / 1000, timezone.utc).isoformat()
+
+
+def _classify_password(password: str) -> tuple[bool, str]:
+    """Classify password strength without calling Claude.
+
+    Uses zxcvbn when it is installed; otherwise checks length, character-class
+    coverage and a fixed set of weak patterns.
+
+    Args:
+        password: Password to classify
+
+    Returns:
+        Tuple of (is_valid, feedback_message)
+    """
+    problems = []
+    if len(password) < _PASSWORD_MIN_LENGTH:
+        problems.append(f"at least {_PASSWORD_MIN_LENGTH} characters")
+    problems.extend(
+        requirement
+        for pattern, requirement in _PASSWORD_CHAR_CLASSES
+        if not pattern.search(password)
+    )
+    if problems:
+        if len(problems) > 1:
+            problems[-2:] = [f"{problems[-2]} and {problems[-1]}"]
+        return False, f"Password needs {', '.join(problems)}."
+
+    if zxcvbn is not None:
+        result = zxcvbn(password)
+        if result["score"] < 3:
+            return False, result["feedback"]["warning"] or "Password is too easy to guess."
+        return True, "Strong password."
+
+    match = _PASSWORD_WEAK_PATTERN_RE.search(password)
+    if match:
+        return False, f"Password contains an easily guessed pattern ('{match.group()}')."
+
+    return True, "Strong password with good character variety."
+
+
+def _parse_password_verdict(response: str) -> bool:
+    """Decide whether Claude's password review accepts the password.
+
+    A single scan over the response: an INVALID verdict or a "very weak" /
+    "extremely weak" remark rejects immediately. Otherwise a VALID verdict
+    accepts, and without a verdict the password is accepted if it is called
+    strong (or said to meet the requirements) and never called weak.
+
+    Args:
+        response: Claude's review text
+
+    Returns:
+        True if the password is accepted
+    """
+    valid = strong = weak = False
+    for match in _VERDICT_RE.finditer(response):
+        kind = match.lastgroup
+        if kind in ("invalid", "very_weak"):
+            return False
+        if kind == "valid":
+            valid = True
+        elif kind == "weak":
+            weak = True
+        else:
+            strong = True
+    return valid or (strong and not weak)
+
+
+class _TTLCache:
+    """Small LRU cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class _UserTable:
+    """Column-oriented in-memory user store.
+
+    Each user is a row index into parallel columns, so scans over one field
+    walk a single list instead of one dict per user. Password hashes and
+    salts are packed into bytearrays of fixed-width rows, and timestamps into
+    int64 arrays.
+    """
+
+    _HASH_SIZE = 32
+    _SALT_SIZE = 16
+    # Salt of rows created before salted hashing; their hash is plain SHA-256
+    LEGACY_SALT = bytes(_SALT_SIZE)
+    # Stored in the last-login column for users who never logged in
+    _NEVER = 0
+
+    def __init__(self):
+        self._idx: dict[str, int] = {}
+        self._usernames: list[str] = []
+        self._emails: list[str] = []
+        self._pwhash = bytearray()
+        self._salt = bytearray()
+        self._created = array.array("q")
+        self._last_login = array.array("q")
+
+    def __contains__(self, username: object) -> bool:
+        return username in self._idx
+
+    def __len__(self) -> int:
+        return len(self._usernames)
+
+    def add(
+        self,
+        username: str,
+        salt: bytes,
+        password_hash: bytes,
+        email: str,
+        created_at: int,
+        last_login: Optional[int] = None,
+    ) -> None:
+        """Append a user row."""
+        self._check_credentials(salt, password_hash)
+        self._idx[username] = len(self._usernames)
+        self._usernames.append(username)
+        self._emails.append(email)
+        self._salt += salt
+        self._pwhash += password_hash
+        self._created.append(created_at)
+        self._last_login.append(self._NEVER if last_login is None else last_login)
+
+    def _check_credentials(self, salt: bytes, password_hash: bytes) -> None:
+        if len(salt) != self._SALT_SIZE:
+            raise ValueError(f"Salt must be {self._SALT_SIZE} bytes")
+        if len(password_hash) != self._HASH_SIZE:
+            raise ValueError(f"Password hash must be {self._HASH_SIZE} bytes")
+
+    def credentials(self, username: str) -> tuple[bytes, bytes]:
+        """Return the stored (salt, password_hash) for a user."""
+        row = self._idx[username]
+        salt_start = row * self._SALT_SIZE
+        hash_start = row * self._HASH_SIZE
+        return (
+            bytes(self._salt[salt_start:salt_start + self._SALT_SIZE]),
+            bytes(self._pwhash[hash_start:hash_start + self._HASH_SIZE]),
+        )
+
+    def set_credentials(self, username: str, salt: bytes, password_hash: bytes) -> None:
+        """Replace the salt and password hash of a user."""
+        self._check_credentials(salt, password_hash)
+        row = self._idx[username]
+        salt_start = row * self._SALT_SIZE
+        hash_start = row * self._HASH_SIZE
+        self._salt[salt_start:salt_start + self._SALT_SIZE] = salt
+        self._pwhash[hash_start:hash_start + self._HASH_SIZE] = password_hash
+
+    def set_last_login(self, username: str, last_login: int) -> None:
+        self._last_login[self._idx[username]] = last_login
+
+    def info(self, username: str) -> dict:
+        """Compose the public fields of a user row into a dict."""
+        row = self._idx[username]
+        last_login = self._last_login[row]
+        return {
+            "email": self._emails[row],
+            "created_at": self._created[row],
+            "last_login": None if last_login == self._NEVER else last_login,
+        }
+
+    @classmethod
+    def from_records(cls, records: dict[str, dict]) -> "_UserTable":
+        """Build a table from the row-oriented on-disk format."""
+        table = cls()
+        for username, record in records.items():
+            salt = record.get("salt")
+            table.add(
+                username,
+                bytes.fromhex(salt) if salt else cls.LEGACY_SALT,
+                bytes.fromhex(record["password_hash"]),
+                record["email"],
+                _to_ms(record["created_at"]),
+                _to_ms(record["last_login"]),
+            )
+        return table
+
+    def to_records(self) -> dict[str, dict]:
+        """Convert the table back to the row-oriented on-disk format."""
+        records = {}
+        for username in self._usernames:
+            salt, password_hash = self.credentials(username)
+            record = {"password_hash": password_hash.hex()}
+            if salt != self.LEGACY_SALT:
+                record["salt"] = salt.hex()
+            records[username] = {**record, **self.info(username)}
+        return records
+
+
+class _UserStore:
+    """A user table loaded from a JSON file, plus the machinery to save it.
+
+    Stores are shared process-wide per database file (see ``open``), so the
+    file is read and parsed once and every UserAuthSystem on the same path
+    sees and saves the same data.
+    """
+
+    _stores: dict[Path, "_UserStore"] = {}
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.users = self._load()
+        # Concurrent changes coalesce into as few writes as possible
+        self.save_pending = False
+        self._save_lock = anyio.Lock()
+
+    @classmethod
+    def open(cls, db_path: Path) -> "_UserStore":
+        """Return the store for a database file, loading it on first use."""
+        key = db_path.resolve()
+        store = cls._stores.get(key)
+        if store is None:
+            store = cls._stores[key] = cls(db_path)
+        return store
+
+    def _load(self) -> _UserTable:
+        """Load users from the database file."""
+        if not self.db_path.exists():
+            return _UserTable()
+        data = self.db_path.read_bytes()
+        records = orjson.loads(data) if orjson is not None else json.loads(data)
+        return _UserTable.from_records(records)
+
+    def _write(self, records: dict[str, dict]):
+        """Write users to the database file.
+
+        The data is written to a temporary file that is then renamed over the
+        database, so an interrupted write never leaves a truncated file. Safe
+        to run in a worker thread since it only touches ``records``.
+
+        Args:
+            records: Snapshot of the user table from ``to_records()``
+        """
+        if orjson is not None:
+            data = orjson.dumps(records, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(records, indent=2).encode()
+
+        tmp_path = self.db_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(self.db_path)
+
+    async def save(self):
+        """Save pending changes, coalescing with concurrent savers.
+
+        Callers queue on the lock; whoever gets it writes every change made so
+        far, and later callers find nothing pending and skip their write. The
+        table is snapshotted on the event loop and encoded and written in a
+        worker thread, so other tasks keep running during disk I/O.
+        """
+        async with self._save_lock:
+            if not self.save_pending:
+                return
+
+            # Cleared before the snapshot so changes made during the write are
+            # picked up by the next save
+            self.save_pending = False
+            records = self.users.to_records()
+            try:
+                await anyio.to_thread.run_sync(self._write, records)
+            except BaseException:
+                self.save_pending = True
+                raise
+
 
 class UserAuthSystem:
     """User authentication system with Claude-powered validation."""
 
-    def __init__(self, db_path: str = "user_auth/users_db.json"):
+    # System prompts are kept byte-for-byte stable so the Claude Code CLI's
+    # automatic prompt caching can reuse the processed prefix between calls
+    _SESSION_SYS_PROMPT = "You assist a user authentication system. Follow the instructions given with each request."
+    _PASSWORD_SYS_PROMPT = "You are a security expert. Analyze password strength and provide concise feedback."
+    _SECURITY_SYS_PROMPT = "You are a security analyst. Provide brief security recommendations."
+    # The shared session keeps every prompt (passwords included) and reply in
+    # its context, so later answers can be swayed by earlier ones; it is
+    # replaced by a fresh one after this many turns
+    _SESSION_MAX_TURNS = 10
+    # Checked against for unknown usernames so they cost as much as a wrong
+    # password and cannot be told apart by response time
+    _DUMMY_SALT = secrets.token_bytes(_UserTable._SALT_SIZE)
+    _DUMMY_HASH = bytes(_UserTable._HASH_SIZE)
+
+    def __init__(
+        self,
+        db_path: str = "user_auth/users_db.json",
+        max_concurrent_claude: int = 5,
+        save_interval: float = 5.0,
+        hedge_delay: float = 10.0,
+    ):
         """Initialize the authentication system.
 
+        Instances using the same ``db_path`` share one in-memory copy of the
+        users, loaded from disk by the first of them.
+
         Args:
             db_path: Path to the JSON file storing user data
+            max_concurrent_claude: Maximum number of one-off Claude requests
+                (including hedged ones) this instance runs at once; further
+                requests wait for a free slot. The shared session inside
+                ``async with`` already runs one request at a time, and other
+                instances have limits of their own.
+            save_interval: Seconds between background saves of pending user
+                changes inside ``async with``
+            hedge_delay: Seconds to wait for a one-off Claude request before
+                sending a backup copy; keep it above typical reply times
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
         self.sessions = {}  # In-memory session storage
-        self._load_users()
+        # (expires_at, token) min-heap used to sweep expired sessions. Entries
+        # of logged-out sessions stay until they expire and are then skipped.
+        self._session_expiry: list[tuple[int, str]] = []
+        self._store = _UserStore.open(self.db_path)
+        self.users = self._store.users
+
+        # Inside ``async with`` user changes are written every
+        # ``save_interval`` seconds by a background task and once more on exit
+        self._defer_saves = False
+        self._save_interval = save_interval
+
+        # Long-lived Claude session, available inside ``async with`` and
+        # connected on the first Claude call
+        self._entered = False
+        self._tg: Optional[anyio.abc.TaskGroup] = None
+        self._client: Optional[ClaudeSDKClient] = None
+        self._client_release: Optional[anyio.Event] = None
+        self._client_lock = anyio.Lock()
+        self._client_pending_reply = False
+        self._client_turns = 0
+        self._claude_limiter = anyio.CapacityLimiter(max_concurrent_claude)
+        self._hedge_delay = hedge_delay
+
+        # Claude verdicts for passwords seen before, keyed by the password hash
+        # so plaintext never sits in the cache
+        self._validation_cache: dict[tuple[str, bytes], tuple[bool, str]] = {}
+        self._analysis_cache = _TTLCache()
+
+    async def __aenter__(self) -> "UserAuthSystem":
+        """Enable a Claude session shared by all validators of this instance.
+
+        The CLI process is only started by the first call that needs Claude,
+        so blocks that never ask Claude never spawn it. User changes are
+        written every ``save_interval`` seconds and when the block exits.
+        """
+        # Hosts the periodic flush and the task that owns the shared client
+        tg = anyio.create_task_group()
+        await tg.__aenter__()
+        tg.start_soon(self._flush_periodically)
+        self._tg = tg
+        # Only defer once the flusher is running, so changes always get saved
+        self._defer_saves = True
+        self._entered = True
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> bool:
+        """Close the shared Claude session and write pending user changes."""
+        try:
+            self._entered = False
+            if self._client_release is not None:
+                # Its holder task disconnects it before the task group exits
+                self._client_release.set()
+                self._client = self._client_release = None
+            if self._tg is not None:
+                tg, self._tg = self._tg, None
+                tg.cancel_scope.cancel()
+                with suppress(anyio.get_cancelled_exc_class()):
+                    await tg.__aexit__(None, None, None)
+        finally:
+            self._defer_saves = False
+            # Shielded so changes already reported as done reach disk even
+            # when the block is left by cancellation
+            with anyio.CancelScope(shield=True):
+                await self._store.save()
+        return False
 
-    def _load_users(self):
-        """Load users from the database file."""
-        if self.db_path.exists():
-            with open(self.db_path, 'r') as f:
-                self.users = json.load(f)
-        else:
-            self.users = {}
+    async def _flush_periodically(self):
+        """Write pending user changes every ``save_interval`` seconds."""
+        while True:
+            await anyio.sleep(self._save_interval)
+            # A failed write leaves the changes pending for the next round
+            with suppress(OSError):
+                await self._store.save()
 
-    def _save_users(self):
-        """Save users to the database file."""
-        with open(self.db_path, 'w') as f:
-            json.dump(self.users, f, indent=2)
+    async def _mark_dirty(self):
+        """Record a user change, saving it now unless saves are deferred."""
+        self._store.save_pending = True
+        if not self._defer_saves:
+            await self._store.save()
 
     @staticmethod
-    def _hash_password(password: str) -> str:
-        """Hash a password using SHA-256.
+    def _hash_password(password: str, salt: bytes) -> bytes:
+        """Hash a password using salted scrypt.
+
+        The scrypt cost (n=2**14, r=8) takes tens of milliseconds per hash,
+        which is unnoticeable for a single login but makes brute force costly.
 
         Args:
             password: Plain text password
+            salt: Per-user random salt
+
+        Returns:
+            Raw 32-byte hash (hex-encoded only when written to disk)
+        """
+        if salt == _UserTable.LEGACY_SALT:
+            # Accounts created before salting; rehashed on their next login
+            return hashlib.sha256(password.encode()).digest()
+        return hashlib.scrypt(password.encode(), salt=salt, n=2**14, r=8, p=1, dklen=32)
+
+    async def _ask(
+        self, system_prompt: str, prompt: str, dedicated: bool = False
+    ) -> Optional[str]:
+        """Send a single prompt to Claude and return the first text reply.
+
+        Uses the shared session when the system is entered with ``async with``
+        (connecting it on first use and replacing it every
+        ``_SESSION_MAX_TURNS`` turns), which answers one prompt at a time.
+        Otherwise a one-off client is spawned for this call and holds one of
+        the ``max_concurrent_claude`` slots while it runs.
+
+        Args:
+            system_prompt: Instructions for this request
+            prompt: The request itself
+            dedicated: Always use a one-off client, even if a shared session
+                is open
+
+        Returns:
+            Text of the first text block in the reply, or None
+        """
+        if not self._entered or dedicated:
+            options = ClaudeAgentOptions(system_prompt=system_prompt, max_turns=1)
+            async with self._claude_limiter, self._one_off_client(options) as client:
+                await client.query(prompt)
+                return await self._read_reply(client)
+
+        # A conversation answers one prompt at a time; the system prompt is
+        # sent as per-turn instructions since the session is shared
+        async with self._client_lock:
+            if self._client is not None and (
+                self._client_turns >= self._SESSION_MAX_TURNS
+            ):
+                # Start over with an empty context instead of letting it grow
+                self._client_release.set()
+                self._client = self._client_release = None
+
+            if self._client is None:
+                options = ClaudeAgentOptions(
+                    system_prompt=self._SESSION_SYS_PROMPT,
+                    max_turns=1
+                )
+                release = anyio.Event()
+                self._client = await self._tg.start(self._hold_client, options, release)
+                self._client_release = release
+                self._client_turns = 0
+                self._client_pending_reply = False
+
+            if self._client_pending_reply:
+                # A previous caller was cancelled mid-reply; discard the rest
+                await self._read_reply(self._client)
+                self._client_pending_reply = False
+
+            # Never abandon a half-written query on the shared stream
+            with anyio.CancelScope(shield=True):
+                await self._client.query(f"{system_prompt}\n\n{prompt}")
+            self._client_turns += 1
+            self._client_pending_reply = True
+            text = await self._read_reply(self._client)
+            self._client_pending_reply = False
+            return text
+
+    async def _hedged_ask(self, system_prompt: str, prompt: str) -> Optional[str]:
+        """Ask Claude, sending a backup request if the first one is slow.
+
+        Only for idempotent requests: if no reply arrives within
+        ``hedge_delay`` seconds (or the first request fails), the same prompt
+        is sent on a second one-off client and whichever reply comes first
+        wins; the other request is cancelled. A reply without text counts as
+        a failure. Both requests count against the Claude concurrency limit,
+        which caps the extra load.
+
+        Requests on the shared session are not hedged: its conversation
+        history would give the backup different input than the primary.
+
+        Args:
+            system_prompt: Instructions for this request
+            prompt: The request itself
 
         Returns:
-            Hashed password
+            Text of the first reply, or None if neither request produced text
+
+        Raises:
+            Exception: The first error, if both requests failed
         """
-        return hashlib.sha256(password.encode()).hexdigest()
+        if self._entered:
+            return await self._ask(system_prompt, prompt)
+
+        replies: list[str] = []
+        errors: list[Exception] = []
+        primary_failed = anyio.Event()
+
+        async def attempt(backup: bool) -> None:
+            if backup:
+                with anyio.move_on_after(self._hedge_delay):
+                    await primary_failed.wait()
+            try:
+                text = await self._ask(system_prompt, prompt, dedicated=True)
+            except Exception as e:
+                errors.append(e)
+                text = None
+            if text is None:
+                if not backup:
+                    # Start the backup now instead of after the full delay
+                    primary_failed.set()
+                return
+            if not replies:
+                replies.append(text)
+                tg.cancel_scope.cancel()
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(attempt, False)
+            tg.start_soon(attempt, True)
+
+        if replies:
+            return replies[0]
+        if len(errors) == 2:
+            raise errors[0]
+        return None
 
-    async def validate_password_strength(self, password: str) -> tuple[bool, str]:
-        """Use Claude to validate password strength.
+    @staticmethod
+    async def _hold_client(
+        options: ClaudeAgentOptions,
+        release: anyio.Event,
+        *,
+        task_status: anyio.abc.TaskStatus = anyio.TASK_STATUS_IGNORED,
+    ) -> None:
+        """Connect a client, hand it to the starter, disconnect on ``release``.
+
+        A client has to be disconnected in the task and cancel scope it was
+        connected in, so each one lives in a task of its own. The task is
+        shielded, so the CLI is always stopped once ``release`` is set, even
+        when the starter is being cancelled.
+        """
+        with anyio.CancelScope(shield=True):
+            client = ClaudeSDKClient(options=options)
+            await client.connect()
+            try:
+                task_status.started(client)
+                await release.wait()
+            finally:
+                await client.disconnect()
+
+    @classmethod
+    @asynccontextmanager
+    async def _one_off_client(cls, options: ClaudeAgentOptions):
+        """Connect a client for the duration of a ``with`` block.
+
+        The CLI is torn down when the block exits, including when it is
+        cancelled (e.g. it lost a hedged race). Errors are re-raised as-is
+        rather than wrapped by the task group.
+        """
+        release = anyio.Event()
+        error = None
+        async with anyio.create_task_group() as tg:
+            try:
+                yield await tg.start(cls._hold_client, options, release)
+            except Exception as e:
+                error = e
+            finally:
+                release.set()
+        if error is not None:
+            raise error
+
+    @staticmethod
+    async def _read_reply(client: ClaudeSDKClient) -> Optional[str]:
+        """Read a full response and return its first text block.
+
+        The response is always drained up to its ResultMessage so the next
+        query on the same client starts from a clean stream.
+        """
+        text = None
+        async for msg in client.receive_response():
+            if text is None and isinstance(msg, AssistantMessage):
+                for block in msg.content:
+                    if isinstance(block, TextBlock):
+                        text = block.text
+                        break
+        return text
+
+    async def validate_password_strength(
+        self, password: str, use_claude: bool = False
+    ) -> tuple[bool, str]:
+        """Validate password strength.
+
+        By default the verdict is computed locally and is deterministic. With
+        ``use_claude`` a password that passes is additionally reviewed by
+        Claude, whose natural-language assessment becomes the feedback and
+        who may still reject it, so the result is no longer deterministic.
 
         Args:
             password: Password to validate
+            use_claude: Ask Claude for a second opinion on passing passwords
 
         Returns:
             Tuple of (is_valid, feedback_message)
         """
-        options = ClaudeAgentOptions(
-            system_prompt="You are a security expert. Analyze password strength and provide concise feedback.",
-            max_turns=1
-        )
+        is_valid, feedback = _classify_password(password)
+        if not is_valid or not use_claude:
+            return is_valid, feedback
+
+        # Plain SHA-256 is enough for an in-memory cache key
+        cache_key = ("pwd", hashlib.sha256(password.encode()).digest())
+        if cache_key in self._validation_cache:
+            return self._validation_cache[cache_key]
 
         prompt = f"""Analyze this password strength: "{password}"
 
@@ -84,34 +731,18 @@ Provide a brief assessment (1-2 sentences) covering:
 Format: "VALID: message" or "INVALID: message"
 """
 
-        async with ClaudeSDKClient(options=options) as client:
-            await client.query(prompt)
-
-            async for msg in client.receive_response():
-                if isinstance(msg, AssistantMessage):
-                    for block in msg.content:
-                        if isinstance(block, TextBlock):
-                            response = block.text.strip()
-                            # Remove markdown formatting
-                            response_clean = response.replace("**", "").strip()
-
-                            if "VALID:" in response_clean or "VALID" in response_clean[:20]:
-                                # Check if it's truly valid or has concerns
-                                if "extremely weak" in response.lower() or "very weak" in response.lower():
-                                    return False, response
-                                return True, response
-                            elif "INVALID:" in response_clean:
-                                return False, response
-                            else:
-                                # Parse response for indicators
-                                is_valid = ("meets" in response.lower() and "requirement" in response.lower()) or \
-                                          ("strong" in response.lower() and "weak" not in response.lower())
-                                return is_valid, response
-
-        return False, "Unable to validate password"
+        text = await self._hedged_ask(self._PASSWORD_SYS_PROMPT, prompt)
+        if text is None:
+            return False, "Unable to validate password"
+
+        response = text.strip()
+        result = _parse_password_verdict(response), response
+
+        self._validation_cache[cache_key] = result
+        return result
 
     async def register_user(self, username: str, password: str, email: str) -> tuple[bool, str]:
-        """Register a new user with Claude-powered validation.
+        """Register a new user.
 
         Args:
             username: Desired username
@@ -125,29 +756,35 @@ Format: "VALID: message" or "INVALID: message"
         if username in self.users:
             return False, f"Username '{username}' already exists"
 
-        # Validate password strength using Claude
+        # Validate email format locally before spending a Claude call
+        if not self._validate_email(email):
+            return False, "Invalid email format"
+
+        # Validate password strength
         is_valid, feedback = await self.validate_password_strength(password)
         if not is_valid:
             return False, f"Weak password: {feedback}"
 
-        # Validate email format using Claude
-        email_valid = await self._validate_email(email)
-        if not email_valid:
-            return False, "Invalid email format"
-
-        # Create user
-        self.users[username] = {
-            "password_hash": self._hash_password(password),
-            "email": email,
-            "created_at": datetime.now().isoformat(),
-            "last_login": None
-        }
+        # Create user. scrypt is deliberately slow, so hash off the event loop.
+        salt = secrets.token_bytes(_UserTable._SALT_SIZE)
+        password_hash = await anyio.to_thread.run_sync(self._hash_password, password, salt)
+        if username in self.users:
+            # Registered concurrently while we were validating and hashing
+            return False, f"Username '{username}' already exists"
+        self.users.add(
+            username,
+            salt,
+            password_hash,
+            email,
+            _now_ms(),
+        )
 
-        self._save_users()
+        await self._mark_dirty()
         return True, f"User '{username}' registered successfully! {feedback}"
 
-    async def _validate_email(self, email: str) -> bool:
-        """Validate email format using Claude.
+    @staticmethod
+    def _validate_email(email: str) -> bool:
+        """Validate email format.
 
         Args:
             email: Email to validate
@@ -155,22 +792,10 @@ Format: "VALID: message" or "INVALID: message"
         Returns:
             True if valid, False otherwise
         """
-        options = ClaudeAgentOptions(
-            system_prompt="You are a validator. Answer only 'YES' or 'NO'.",
-            max_turns=1
-        )
-
-        async with ClaudeSDKClient(options=options) as client:
-            await client.query(f"Is this a valid email format? {email}")
-
-            async for msg in client.receive_response():
-                if isinstance(msg, AssistantMessage):
-                    for block in msg.content:
-                        if isinstance(block, TextBlock):
-                            response = block.text.strip().upper()
-                            return "YES" in response
-
-        return False
+        if not _EMAIL_RE.match(email):
+            return False
+        # Reject anything parseaddr reads as more than a bare address
+        return parseaddr(email)[1] == email
 
     async def login(self, username: str, password: str) -> tuple[bool, str, Optional[str]]:
         """Authenticate a user.
@@ -182,28 +807,40 @@ Format: "VALID: message" or "INVALID: message"
         Returns:
             Tuple of (success, message, session_token)
         """
-        if username not in self.users:
+        # Check password. Unknown usernames are hashed against dummy
+        # credentials and compared in constant time, so whether a username
+        # exists does not show in the response time; scrypt runs off the
+        # event loop.
+        known = username in self.users
+        if known:
+            salt, stored_hash = self.users.credentials(username)
+        else:
+            salt, stored_hash = self._DUMMY_SALT, self._DUMMY_HASH
+        password_hash = await anyio.to_thread.run_sync(self._hash_password, password, salt)
+        if not hmac.compare_digest(stored_hash, password_hash) or not known:
             return False, "Invalid username or password", None
 
-        # Check password
-        password_hash = self._hash_password(password)
-        if self.users[username]["password_hash"] != password_hash:
-            return False, "Invalid username or password", None
+        if salt == _UserTable.LEGACY_SALT:
+            # Upgrade an unsalted SHA-256 account now that we know the password
+            salt = secrets.token_bytes(_UserTable._SALT_SIZE)
+            password_hash = await anyio.to_thread.run_sync(self._hash_password, password, salt)
+            self.users.set_credentials(username, salt, password_hash)
 
         # Create session
-        session_token = hashlib.sha256(
-            f"{username}{datetime.now().isoformat()}".encode()
-        ).hexdigest()
+        session_token = secrets.token_hex(32)
 
+        now = _now_ms()
+        self._sweep_sessions(now)
         self.sessions[session_token] = {
             "username": username,
-            "login_time": datetime.now(),
-            "expires_at": datetime.now() + timedelta(hours=24)
+            "login_time": now,
+            "expires_at": now + _SESSION_TTL_MS
         }
+        heapq.heappush(self._session_expiry, (now + _SESSION_TTL_MS, session_token))
 
         # Update last login
-        self.users[username]["last_login"] = datetime.now().isoformat()
-        self._save_users()
+        self.users.set_last_login(username, now)
+        await self._mark_dirty()
 
         return True, f"Welcome back, {username}!", session_token
 
@@ -216,18 +853,30 @@ Format: "VALID: message" or "INVALID: message"
         Returns:
             Tuple of (is_valid, username)
         """
-        if session_token not in self.sessions:
-            return False, None
+        # Drop expired sessions first, so anything left is still valid
+        self._sweep_sessions(_now_ms())
 
-        session = self.sessions[session_token]
-
-        # Check if expired
-        if datetime.now() > session["expires_at"]:
-            del self.sessions[session_token]
+        session = self.sessions.get(session_token)
+        if session is None:
             return False, None
 
         return True, session["username"]
 
+    def _sweep_sessions(self, now: int) -> None:
+        """Remove every session that expired before ``now``.
+
+        Pops from the expiry heap until its earliest entry is still live, so
+        the cost is proportional to the number of expired sessions.
+
+        Args:
+            now: Current time in epoch milliseconds
+        """
+        expiry = self._session_expiry
+        while expiry and expiry[0][0] < now:
+            _, token = heapq.heappop(expiry)
+            # Already gone if the user logged out
+            self.sessions.pop(token, None)
+
     def logout(self, session_token: str) -> bool:
         """Logout a user by invalidating their session.
 
@@ -249,14 +898,14 @@ Format: "VALID: message" or "INVALID: message"
             username: Username to lookup
 
         Returns:
-            User info dict or None
+            User info dict or None; ``created_at`` and ``last_login`` are epoch
+            milliseconds (``last_login`` is None before the first login)
         """
         if username not in self.users:
             return None
 
-        user_data = self.users[username].copy()
-        user_data.pop("password_hash", None)  # Don't expose password hash
-        return user_data
+        # Password hash is not part of the composed info
+        return self.users.info(username)
 
     async def analyze_security_risk(self, username: str) -> str:
         """Use Claude to analyze account security.
@@ -271,25 +920,21 @@ Format: "VALID: message" or "INVALID: message"
             return "User not found"
 
         user_info = self.get_user_info(username)
-
-        options = ClaudeAgentOptions(
-            system_prompt="You are a security analyst. Provide brief security recommendations.",
-            max_turns=1
-        )
+        last_login = user_info["last_login"]
 
         prompt = f"""Analyze this user account security:
-- Created: {user_info['created_at']}
-- Last login: {user_info['last_login'] or 'Never'}
+- Created: {_format_ms(user_info['created_at'])}
+- Last login: {_format_ms(last_login) if last_login is not None else 'Never'}
 
 Provide 2-3 brief security recommendations."""
 
-        async with ClaudeSDKClient(options=options) as client:
-            await client.query(prompt)
+        cached = self._analysis_cache.get(prompt)
+        if cached is not None:
+            return cached
 
-            async for msg in client.receive_response():
-                if isinstance(msg, AssistantMessage):
-                    for block in msg.content:
-                        if isinstance(block, TextBlock):
-                            return block.text
+        text = await self._hedged_ask(self._SECURITY_SYS_PROMPT, prompt)
+        if text is None:
+            return "Unable to analyze security"
 
-        return "Unable to analyze security"
+        self._analysis_cache.set(prompt, text)
+        return text